@@ -5,6 +5,7 @@ Drug Compatibility Checker - Streamlit App
 
 import streamlit as st
 import json
+import mmap
 import os
 import re
 import time
@@ -17,6 +18,52 @@ import urllib.parse
 import urllib.request
 from bs4 import BeautifulSoup
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# ijson already picks the fastest importable backend (yajl2_c first); a larger
+# read buffer cuts the number of C -> Python round trips on multi-GB files.
+IJSON_BUF_SIZE = 256 * 1024
+
+# Fields kept from each OpenFDA entry's parsed_dosing block
+OPENFDA_DOSING_KEYS = (
+    'frequency', 'times_per_day', 'times_per_day_range', 'routes',
+    'route', 'instructions', 'has_dosing', 'source',
+)
+
+# Low-cardinality dosing fields shared across thousands of OpenFDA entries
+OPENFDA_INTERNED_KEYS = ('frequency', 'times_per_day_range', 'route', 'source')
+_INTERNED_STRINGS: Dict[str, str] = {}
+
+# Dosing frequency phrases recognised in free-text instructions
+FREQUENCY_PATTERNS = (
+    (re.compile(r'\bonce\s+(?:a\s+)?daily\b'), 'Once daily', '1'),
+    (re.compile(r'\btwice\s+(?:a\s+)?daily\b'), 'Twice daily', '2'),
+    (re.compile(r'\bthree\s+times\s+daily\b'), 'Three times daily', '3'),
+    (re.compile(r'\bfour\s+times\s+daily\b'), 'Four times daily', '4'),
+)
+
+# Experimental properties surfaced in drug summaries
+ESSENTIAL_PROPERTY_KINDS = frozenset(
+    ('Melting Point', 'Water Solubility', 'Molecular Weight', 'logP', 'pKa')
+)
+
 
 if 'active_app' not in st.session_state:
     st.session_state['active_app'] = 'drug'
@@ -55,6 +102,93 @@ def render_athero_app():
         st.error("The Athero app module does not expose a 'main()' function.")
 
 
+def _intern(value):
+    """Return one shared instance per distinct string so repeated values cost no extra memory."""
+    if isinstance(value, str):
+        return _INTERNED_STRINGS.setdefault(value, value)
+    return value
+
+
+def _as_list(values) -> List:
+    if isinstance(values, list):
+        return values
+    if isinstance(values, str):
+        return [values]
+    return []
+
+
+def _clean_list(values) -> List[str]:
+    """Return the non-empty, stripped strings from a str-or-list field."""
+    return [text for v in _as_list(values) if isinstance(v, str) and (text := v.strip())]
+
+
+def _prefer_msgpack_sidecar(path: str) -> str:
+    """Use a MessagePack copy of the database next to the JSON file if it is up to date."""
+    if not MSGSPEC_AVAILABLE:
+        return path
+    sidecar = os.path.splitext(path)[0] + '.msgpack'
+    if not os.path.exists(sidecar):
+        return path
+    if os.path.exists(path) and os.path.getmtime(sidecar) < os.path.getmtime(path):
+        return path
+    return sidecar
+
+
+def _resolve_database_file(path: str) -> str:
+    """Pick the fastest available copy of a database file, falling back to a .zst copy."""
+    path = _prefer_msgpack_sidecar(path)
+    if not os.path.exists(path) and ZSTD_AVAILABLE and os.path.exists(path + '.zst'):
+        return path + '.zst'
+    return path
+
+
+def _decode_json(data) -> Dict:
+    """Decode JSON with orjson, retrying with the stdlib decoder for input orjson rejects.
+
+    json.dump writes NaN/Infinity by default and Python ints can exceed 64 bits;
+    orjson refuses both, while json.loads accepts them.
+    """
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(bytes(data))
+
+
+def _load_database_file(path: str) -> Dict:
+    """Parse the drug database file, preferring orjson over the stdlib decoder.
+
+    The fast decoders read straight from a memory map, so the raw file is never
+    copied into a second in-memory bytes object alongside the parsed result.
+    Zstandard-compressed files (``*.zst``) are decompressed in one pass first.
+    """
+    compressed = path.endswith('.zst')
+    if compressed and not ZSTD_AVAILABLE:
+        raise ImportError(f"Reading {path} requires zstandard; install it with 'pip install zstandard'.")
+    inner_path = path[:-len('.zst')] if compressed else path
+    if inner_path.endswith('.msgpack'):
+        if not MSGSPEC_AVAILABLE:
+            raise ImportError(f"Reading {path} requires msgspec; install it with 'pip install msgspec'.")
+        decode = msgspec.msgpack.decode
+    elif ORJSON_AVAILABLE:
+        decode = _decode_json
+    else:
+        decode = json.loads
+    with open(path, 'rb') as f:
+        if compressed:
+            with zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+                return decode(reader.read())
+        if decode is json.loads:
+            return json.load(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap rejects empty files; let the decoder report the bad input instead
+            return decode(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                return decode(view)
+
+
 class ComprehensiveDrugQuery:
     """Query interface for comprehensive database with OpenFDA fallback"""
 
@@ -63,10 +197,11 @@ class ComprehensiveDrugQuery:
         db_file: str = 'comprehensive_drug_database_compact.json',
         openfda_file: str = 'OpenFDAfull.json',
     ):
-        # Resolve database path (use compact version if available)
-        preferred_db = os.getenv('DRUG_DB_FILE', db_file)
+        # Resolve database path (use compact version if available); an explicit
+        # DRUG_DB_FILE is used as given, without sidecar or .zst substitution
+        preferred_db = os.getenv('DRUG_DB_FILE') or _resolve_database_file(db_file)
         if not os.path.exists(preferred_db):
-            preferred_db = 'comprehensive_drug_database.json'
+            preferred_db = _resolve_database_file('comprehensive_drug_database.json')
         
         if not os.path.exists(preferred_db):
             raise FileNotFoundError(
@@ -76,8 +211,7 @@ class ComprehensiveDrugQuery:
         
         self.db_file = preferred_db
         print(f"Loading drug database from {self.db_file}")
-        with open(self.db_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_database_file(self.db_file)
         
         self.metadata = data.get('metadata', {})
         self.drugs = data.get('drugs', [])
@@ -117,7 +251,7 @@ class ComprehensiveDrugQuery:
         """Stream OpenFDA dataset and keep only lightweight dosing/index info."""
         try:
             with open(openfda_file, 'rb') as f:
-                for drug_id, raw_entry in ijson.kvitems(f, 'drugs'):
+                for drug_id, raw_entry in ijson.kvitems(f, 'drugs', buf_size=IJSON_BUF_SIZE, use_float=True):
                     simplified = self._simplify_openfda_entry(raw_entry)
                     if simplified:
                         self.openfda_drugs[drug_id] = simplified
@@ -143,35 +277,22 @@ class ComprehensiveDrugQuery:
         parsed_dosing = openfda_data.get('parsed_dosing', {}) or {}
         openfda_meta = openfda_data.get('openfda', {}) or {}
         
-        def _as_list(values):
-            if isinstance(values, list):
-                return values
-            if isinstance(values, str):
-                return [values]
-            return []
-        
-        def _clean_list(values):
-            return [str(v).strip() for v in _as_list(values) if isinstance(v, str) and v.strip()]
-        
-        simplified = {
+        dosing = {key: parsed_dosing.get(key) for key in OPENFDA_DOSING_KEYS}
+        if not dosing['routes']:
+            dosing['routes'] = _clean_list(openfda_meta.get('route', []))
+        if isinstance(dosing['routes'], list):
+            dosing['routes'] = [_intern(route) for route in dosing['routes']]
+        for key in OPENFDA_INTERNED_KEYS:
+            dosing[key] = _intern(dosing[key])
+        # Drop entries without useful dosing data
+        if not any(dosing.values()):
+            return None
+        return {
             'drug_name': raw_entry.get('drug_name', '').strip(),
             'generic_names': _clean_list(openfda_meta.get('generic_name', [])),
             'brand_names': _clean_list(openfda_meta.get('brand_name', [])),
-            'parsed_dosing': {
-                'frequency': parsed_dosing.get('frequency'),
-                'times_per_day': parsed_dosing.get('times_per_day'),
-                'times_per_day_range': parsed_dosing.get('times_per_day_range'),
-                'routes': parsed_dosing.get('routes') or _clean_list(openfda_meta.get('route', [])),
-                'route': parsed_dosing.get('route'),
-                'instructions': parsed_dosing.get('instructions'),
-                'has_dosing': parsed_dosing.get('has_dosing'),
-                'source': parsed_dosing.get('source'),
-            }
+            'parsed_dosing': dosing,
         }
-        # Drop entries without useful dosing data
-        if not any(simplified['parsed_dosing'].values()):
-            return None
-        return simplified
     
     def _index_openfda_name(self, name: Optional[str], drug_id: str) -> None:
         if not name:
@@ -298,18 +419,11 @@ class ComprehensiveDrugQuery:
         if not frequency and instructions:
             instructions_lower = instructions.lower()
             # Look for "once daily", "twice daily", etc.
-            if re.search(r'\bonce\s+(?:a\s+)?daily\b', instructions_lower):
-                frequency = 'Once daily'
-                times_per_day = '1'
-            elif re.search(r'\btwice\s+(?:a\s+)?daily\b', instructions_lower):
-                frequency = 'Twice daily'
-                times_per_day = '2'
-            elif re.search(r'\bthree\s+times\s+daily\b', instructions_lower):
-                frequency = 'Three times daily'
-                times_per_day = '3'
-            elif re.search(r'\bfour\s+times\s+daily\b', instructions_lower):
-                frequency = 'Four times daily'
-                times_per_day = '4'
+            for pattern, label, times in FREQUENCY_PATTERNS:
+                if pattern.search(instructions_lower):
+                    frequency = label
+                    times_per_day = times
+                    break
         
         summary = {
             'name': drug.get('name'),
@@ -349,7 +463,7 @@ class ComprehensiveDrugQuery:
         # Extract key properties
         for prop in drug.get('experimental_properties', []):
             kind = prop.get('kind')
-            if kind in ['Melting Point', 'Water Solubility', 'Molecular Weight', 'logP', 'pKa']:
+            if kind in ESSENTIAL_PROPERTY_KINDS:
                 summary['properties'][kind] = prop.get('value')
         
         return summary
@@ -506,18 +620,11 @@ class ComprehensiveDrugQuery:
             # Parse from instructions if still missing
             if not frequency and instructions:
                 instructions_lower = instructions.lower()
-                if re.search(r'\bonce\s+(?:a\s+)?daily\b', instructions_lower):
-                    frequency = 'Once daily'
-                    times_per_day = '1'
-                elif re.search(r'\btwice\s+(?:a\s+)?daily\b', instructions_lower):
-                    frequency = 'Twice daily'
-                    times_per_day = '2'
-                elif re.search(r'\bthree\s+times\s+daily\b', instructions_lower):
-                    frequency = 'Three times daily'
-                    times_per_day = '3'
-                elif re.search(r'\bfour\s+times\s+daily\b', instructions_lower):
-                    frequency = 'Four times daily'
-                    times_per_day = '4'
+                for pattern, label, times in FREQUENCY_PATTERNS:
+                    if pattern.search(instructions_lower):
+                        frequency = label
+                        times_per_day = times
+                        break
             
             return frequency, times_per_day
         
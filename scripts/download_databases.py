@@ -7,12 +7,16 @@ Defaults to the provided Google Drive link for the compact DB.
 
 from __future__ import annotations
 
+import glob
+import json
 import os
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 
 import gdown
+import requests
 
 ROOT = Path(__file__).resolve().parents[1]
 COMPACT_DB = ROOT / "comprehensive_drug_database_compact.json"
@@ -21,19 +25,29 @@ FULL_DB = ROOT / "comprehensive_drug_database.json"
 # Default compact DB URL provided by user
 DEFAULT_COMPACT_URL = "https://drive.google.com/file/d/12o_cdObA01lxXJMY8LjCqlPVrXF56bZF/view?usp=drive_link"
 
+# Transient network failures are retried; gdown resumes from its partial file
+DOWNLOAD_ATTEMPTS = 4
+RETRY_BACKOFF_SECONDS = 2
+
 
 def download_file(url: str, target: Path) -> bool:
     """Download a file (supports Google Drive links via gdown)."""
+    # gdown's resume picks up any file starting with the output name, so it gets
+    # a dedicated partial path that cannot collide with e.g. a shipped .json.zst
+    partial = target.with_name(target.name + ".part")
     try:
-        if target.exists():
-            target.unlink()
         target.parent.mkdir(parents=True, exist_ok=True)
-        gdown.download(url, str(target), quiet=False, fuzzy=True)
-        size_mb = target.stat().st_size / (1024 ** 2)
-        if size_mb < 5 or _looks_like_html(target):
-            target.unlink(missing_ok=True)
+        # Only resume within this run: leftovers may belong to another URL or revision
+        for stale in target.parent.glob(glob.escape(partial.name) + "*"):
+            stale.unlink()
+        _download_with_retries(url, partial)
+        size_mb = partial.stat().st_size / (1024 ** 2)
+        if size_mb < 5 or _looks_like_html(partial):
+            partial.unlink(missing_ok=True)
             raise ValueError("Download appears to be HTML/too small; Google Drive may have blocked the request.")
 
+        os.replace(partial, target)
+        _write_meta(target, url)
         print(f"✓ Downloaded {target.name} ({size_mb:.1f} MB)")
         return True
     except Exception as exc:
@@ -41,6 +55,20 @@ def download_file(url: str, target: Path) -> bool:
         return False
 
 
+def _download_with_retries(url: str, target: Path) -> None:
+    """Run gdown, resuming the partial download after connection errors."""
+    for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+        try:
+            gdown.download(url, str(target), quiet=False, fuzzy=True, resume=True)
+            return
+        except requests.exceptions.RequestException as exc:
+            if attempt == DOWNLOAD_ATTEMPTS:
+                raise
+            delay = RETRY_BACKOFF_SECONDS ** attempt
+            print(f"⚠️  Download interrupted ({exc}); resuming in {delay}s (attempt {attempt + 1}/{DOWNLOAD_ATTEMPTS})")
+            time.sleep(delay)
+
+
 def _looks_like_html(path: Path) -> bool:
     try:
         with open(path, "rb") as f:
@@ -50,8 +78,35 @@ def _looks_like_html(path: Path) -> bool:
         return False
 
 
+def _meta_path(target: Path) -> Path:
+    return target.with_suffix(".meta.json")
+
+
+def _write_meta(target: Path, url: str) -> None:
+    """Record which URL a downloaded file came from so later builds can reuse it."""
+    meta = {"url": url}
+    _meta_path(target).write_text(json.dumps(meta, indent=2))
+
+
+def _is_current(target: Path, url: Optional[str]) -> bool:
+    """Keep an existing file unless it was downloaded from a different URL than the configured one.
+
+    This only detects URL changes; the remote copy is not revalidated, and local
+    edits (e.g. regenerating with compact_database.py) are kept.
+    """
+    try:
+        meta = json.loads(_meta_path(target).read_text())
+    except (OSError, ValueError):
+        # No metadata: the file was placed by hand, keep it
+        return True
+    if url and meta.get("url") != url:
+        print(f"↻ {target.name} was downloaded from a different URL; refreshing.")
+        return False
+    return True
+
+
 def ensure_file(target: Path, url: Optional[str]) -> None:
-    if target.exists():
+    if target.exists() and (not url or _is_current(target, url)):
         print(f"✓ {target.name} already present ({target.stat().st_size / (1024 ** 2):.1f} MB)")
         return
     if not url: